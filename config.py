@@ -11,9 +11,15 @@ API_HASH = os.getenv("API_HASH", "")              # e.g. "2fe31e84..."
 BOT_TOKEN = os.getenv("BOT_TOKEN", "")            # e.g. "8580...:AAFoo..."
 OWNER_ID = int(os.getenv("OWNER_ID", "0"))        # e.g. 1735522859
 STORAGE_CHAT_ID = int(os.getenv("STORAGE_CHAT_ID", "0"))  # e.g. -1002849045181
+# Extra storage groups holding mirrored copies of segments, comma separated, e.g. "-1001111,-1002222"
+STORAGE_MIRROR_CHAT_IDS = [int(x) for x in os.getenv("STORAGE_MIRROR_CHAT_IDS", "").split(",") if x.strip()]
+STORAGE_CHAT_IDS = [c for c in [STORAGE_CHAT_ID] + STORAGE_MIRROR_CHAT_IDS if c]
 
 # General settings
 DEFAULT_SEND_DELAY = float(os.getenv("DEFAULT_SEND_DELAY", "2.0"))  # seconds between copied messages
 WAIT_AD_SECONDS = int(os.getenv("WAIT_AD_SECONDS", "10"))
 VIP_PRICE_LABEL = os.getenv("VIP_PRICE_LABEL", "Contact @osamu1123 to buy VIP")
 BOT_USERNAME = os.getenv("BOT_USERNAME", "")  # Optional: Bot username for deep links
+STORAGE_COOLDOWN_SECONDS = float(os.getenv("STORAGE_COOLDOWN_SECONDS", "30"))  # skip a storage chat this long after it became unreadable
+FLOOD_WAIT_MAX_SECONDS = float(os.getenv("FLOOD_WAIT_MAX_SECONDS", "60"))  # longest FloodWait slept off per retry during delivery
+DEAD_MARK_BATCH = int(os.getenv("DEAD_MARK_BATCH", "100"))  # dead recipients buffered per DB write during broadcast
@@ -9,6 +9,10 @@ from config import DATABASE_PATH
 
 _lock = threading.Lock()
 
+# Hot read caches, filled in bulk by warm_caches() at startup and kept in sync by the write helpers below.
+# A missing key means "cold": readers fall back to SQLite.
+_cache = {}
+
 def get_conn():
     conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
@@ -31,15 +35,26 @@ def init_db():
             created_at TEXT
         )
         """)
-        # users: id, is_vip (0/1), banned (0/1)
+        # users: id, is_vip (0/1), banned (0/1), is_dead (0/1) + reason/time of the last permanent send failure
         cur.execute("""
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY,
             is_vip INTEGER DEFAULT 0,
             banned INTEGER DEFAULT 0,
-            created_at TEXT
+            created_at TEXT,
+            is_dead INTEGER DEFAULT 0,
+            dead_reason TEXT,
+            dead_at TEXT
         )
         """)
+        # migrate older databases created before dead-recipient tracking
+        cur.execute("PRAGMA table_info(users)")
+        user_cols = {r["name"] for r in cur.fetchall()}
+        for col, ddl in (("is_dead", "INTEGER DEFAULT 0"), ("dead_reason", "TEXT"), ("dead_at", "TEXT")):
+            if col not in user_cols:
+                cur.execute(f"ALTER TABLE users ADD COLUMN {col} {ddl}")
+        # fan-out paths select live users only
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_users_is_dead ON users (is_dead, id)")
         # channels: chat_id, name, join_link
         cur.execute("""
         CREATE TABLE IF NOT EXISTS force_channels (
@@ -59,6 +74,16 @@ def init_db():
             created_at TEXT
         )
         """)
+        # movie_mirrors: copies of a movie's segments in another storage chat, same order as movies.message_ids
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS movie_mirrors (
+            movie_id INTEGER NOT NULL,
+            chat_id INTEGER NOT NULL,
+            message_ids TEXT,
+            created_at TEXT,
+            PRIMARY KEY (movie_id, chat_id)
+        )
+        """)
         conn.commit()
         conn.close()
 
@@ -87,6 +112,9 @@ def get_movie_by_id(movie_id):
     return dict(row)
 
 def get_movie_by_token(token):
+    movies = _cache.get("movies_by_token")
+    if movies is not None and token in movies:
+        return dict(movies[token])
     conn = get_conn()
     c = conn.cursor()
     c.execute("SELECT * FROM movies WHERE token = ?", (token,))
@@ -94,8 +122,16 @@ def get_movie_by_token(token):
     conn.close()
     if not row:
         return None
+    if movies is not None:
+        movies[token] = dict(row)
     return dict(row)
 
+def _drop_cached_movie(movie_id):
+    movies = _cache.get("movies_by_token")
+    if movies is not None:
+        for token in [t for t, m in movies.items() if m["id"] == movie_id]:
+            del movies[token]
+
 def set_movie_poster(movie_id, chat_id, message_id):
     with _lock:
         conn = get_conn()
@@ -103,6 +139,7 @@ def set_movie_poster(movie_id, chat_id, message_id):
         c.execute("UPDATE movies SET poster_chat_id=?, poster_message_id=? WHERE id=?", (chat_id, message_id, movie_id))
         conn.commit()
         conn.close()
+        _drop_cached_movie(movie_id)
 
 def set_movie_token(movie_id, token):
     with _lock:
@@ -111,6 +148,35 @@ def set_movie_token(movie_id, token):
         c.execute("UPDATE movies SET token=? WHERE id=?", (token, movie_id))
         conn.commit()
         conn.close()
+        _drop_cached_movie(movie_id)
+
+def set_movie_mirror(movie_id, chat_id, message_ids):
+    with _lock:
+        conn = get_conn()
+        c = conn.cursor()
+        now = datetime.utcnow().isoformat()
+        c.execute("INSERT OR REPLACE INTO movie_mirrors (movie_id, chat_id, message_ids, created_at) VALUES (?,?,?,?)",
+                  (movie_id, chat_id, json.dumps(message_ids), now))
+        conn.commit()
+        conn.close()
+
+def delete_movie_mirror(movie_id, chat_id):
+    with _lock:
+        conn = get_conn()
+        c = conn.cursor()
+        c.execute("DELETE FROM movie_mirrors WHERE movie_id=? AND chat_id=?", (movie_id, chat_id))
+        removed = c.rowcount
+        conn.commit()
+        conn.close()
+        return removed
+
+def list_movie_mirrors(movie_id):
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute("SELECT * FROM movie_mirrors WHERE movie_id=? ORDER BY chat_id", (movie_id,))
+    rows = c.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
 
 def list_movies():
     conn = get_conn()
@@ -131,6 +197,43 @@ def add_user_if_missing(user_id):
             conn.commit()
         conn.close()
 
+def mark_users_dead(entries):
+    # entries: iterable of (user_id, reason); written in one batch
+    now = datetime.utcnow().isoformat()
+    params = [(reason, now, user_id) for user_id, reason in entries]
+    if not params:
+        return
+    with _lock:
+        conn = get_conn()
+        c = conn.cursor()
+        c.executemany("UPDATE users SET is_dead=1, dead_reason=?, dead_at=? WHERE id=?", params)
+        conn.commit()
+        conn.close()
+
+def revive_user(user_id):
+    # cheap unlocked read first so the common (alive) case never opens a write transaction
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute("SELECT is_dead FROM users WHERE id=?", (user_id,))
+    row = c.fetchone()
+    conn.close()
+    if not row or not row["is_dead"]:
+        return
+    with _lock:
+        conn = get_conn()
+        c = conn.cursor()
+        c.execute("UPDATE users SET is_dead=0, dead_reason=NULL, dead_at=NULL WHERE id=? AND is_dead=1", (user_id,))
+        conn.commit()
+        conn.close()
+
+def list_live_user_ids():
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute("SELECT id FROM users WHERE is_dead=0")
+    rows = c.fetchall()
+    conn.close()
+    return [r["id"] for r in rows]
+
 def set_vip(user_id, is_vip: bool):
     add_user_if_missing(user_id)
     with _lock:
@@ -139,8 +242,17 @@ def set_vip(user_id, is_vip: bool):
         c.execute("UPDATE users SET is_vip=? WHERE id=?", (1 if is_vip else 0, user_id))
         conn.commit()
         conn.close()
+        vips = _cache.get("vip_ids")
+        if vips is not None:
+            if is_vip:
+                vips.add(user_id)
+            else:
+                vips.discard(user_id)
 
 def is_vip(user_id):
+    vips = _cache.get("vip_ids")
+    if vips is not None:
+        return user_id in vips
     conn = get_conn()
     c = conn.cursor()
     c.execute("SELECT is_vip FROM users WHERE id=?", (user_id,))
@@ -155,13 +267,19 @@ def add_force_channel(chat_id, name=None, invite_link=None):
         c.execute("INSERT OR REPLACE INTO force_channels (chat_id, name, invite_link) VALUES (?,?,?)", (chat_id, name, invite_link))
         conn.commit()
         conn.close()
+        _cache.pop("force_channels", None)
 
 def list_force_channels():
+    channels = _cache.get("force_channels")
+    if channels is not None:
+        return [dict(r) for r in channels]
     conn = get_conn()
     c = conn.cursor()
     c.execute("SELECT * FROM force_channels")
     rows = c.fetchall()
     conn.close()
+    if _cache.get("warm"):
+        _cache["force_channels"] = [dict(r) for r in rows]
     return [dict(r) for r in rows]
 
 def delete_force_channel(chat_id):
@@ -171,6 +289,7 @@ def delete_force_channel(chat_id):
         c.execute("DELETE FROM force_channels WHERE chat_id=?", (chat_id,))
         conn.commit()
         conn.close()
+        _cache.pop("force_channels", None)
 
 def set_waiting_ad(media_chat_id, media_message_id, url=None, text=None):
     with _lock:
@@ -181,14 +300,40 @@ def set_waiting_ad(media_chat_id, media_message_id, url=None, text=None):
                   (media_chat_id, media_message_id, url, text, now))
         conn.commit()
         conn.close()
+        _cache.pop("waiting_ad", None)
 
 def get_latest_waiting_ad():
+    if "waiting_ad" in _cache:
+        ad = _cache["waiting_ad"]
+        return dict(ad) if ad else None
     conn = get_conn()
     c = conn.cursor()
     c.execute("SELECT * FROM waiting_ads ORDER BY id DESC LIMIT 1")
     row = c.fetchone()
     conn.close()
+    if _cache.get("warm"):
+        _cache["waiting_ad"] = dict(row) if row else None
     return dict(row) if row else None
+
+def warm_caches():
+    # Readiness phase: load the data every /start touches with one query per table.
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute("SELECT * FROM movies WHERE token IS NOT NULL")
+    movies = {r["token"]: dict(r) for r in c.fetchall()}
+    c.execute("SELECT id FROM users WHERE is_vip=1")
+    vips = {r["id"] for r in c.fetchall()}
+    c.execute("SELECT * FROM force_channels")
+    channels = [dict(r) for r in c.fetchall()]
+    c.execute("SELECT * FROM waiting_ads ORDER BY id DESC LIMIT 1")
+    ad = c.fetchone()
+    conn.close()
+    _cache["movies_by_token"] = movies
+    _cache["vip_ids"] = vips
+    _cache["force_channels"] = channels
+    _cache["waiting_ad"] = dict(ad) if ad else None
+    _cache["warm"] = True
+    return {"movies": len(movies), "vips": len(vips), "channels": len(channels), "ad": ad is not None}
 ```
 
 ```python name=models.py
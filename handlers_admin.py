@@ -3,9 +3,9 @@
 
 from pyrogram import filters
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
-from config import OWNER_ID, STORAGE_CHAT_ID, BOT_USERNAME
-from db import add_movie, set_movie_poster, set_movie_token, add_user_if_missing, set_vip, add_force_channel, list_force_channels, delete_force_channel, list_movies, get_movie_by_id
-from utils import parse_ids_text, gen_token
+from config import OWNER_ID, STORAGE_CHAT_ID, STORAGE_CHAT_IDS, BOT_USERNAME, DEAD_MARK_BATCH
+from db import add_movie, set_movie_poster, set_movie_token, add_user_if_missing, set_vip, add_force_channel, list_force_channels, delete_force_channel, list_movies, get_movie_by_id, list_live_user_ids, mark_users_dead, set_movie_mirror, delete_movie_mirror, list_movie_mirrors
+from utils import parse_ids_text, gen_token, classify_send_error, chunked, message_fingerprint, format_ranges
 import json
 import asyncio
 
@@ -45,31 +45,172 @@ def register_admin_handlers(app):
 
     @app.on_message(filters.command("set_poster") & filters.private & filters.user(OWNER_ID))
     async def cmd_set_poster(_, m: Message):
-        # /set_poster <movie_id>|<poster_message_id>
+        # /set_poster <movie_id>|<poster_message_id>[|<storage_chat_id>]
         if len(m.text.split(" ",1)) < 2:
-            await m.reply("Usage:\n/set_poster <movie_id>|<poster_message_id>")
+            await m.reply("Usage:\n/set_poster <movie_id>|<poster_message_id>[|<storage_chat_id>]")
             return
         try:
             payload = m.text.split(" ",1)[1]
-            movie_id_s, poster_msg_s = [p.strip() for p in payload.split("|",1)]
-            movie_id = int(movie_id_s)
-            poster_msg = int(poster_msg_s)
+            parts = [p.strip() for p in payload.split("|",2)]
+            movie_id = int(parts[0])
+            poster_msg = int(parts[1])
+            storage_chat = int(parts[2]) if len(parts) > 2 else STORAGE_CHAT_ID
         except:
             await m.reply("Invalid input.")
             return
+        if storage_chat not in STORAGE_CHAT_IDS:
+            await m.reply("That chat is not a configured storage group.")
+            return
         movie = get_movie_by_id(movie_id)
         if not movie:
             await m.reply("Movie not found.")
             return
         # verify poster exists in storage chat
         try:
-            await app.get_messages(STORAGE_CHAT_ID, [poster_msg])
+            found = await app.get_messages(storage_chat, [poster_msg])
         except Exception as e:
             await m.reply(f"Couldn't find that message in storage group: {e}")
             return
-        set_movie_poster(movie_id, STORAGE_CHAT_ID, poster_msg)
+        if not found or message_fingerprint(found[0]) is None:
+            await m.reply("Couldn't find that message in storage group.")
+            return
+        set_movie_poster(movie_id, storage_chat, poster_msg)
         await m.reply("Poster set successfully.")
 
+    async def fetch_fingerprints(chat_id, ids):
+        # one get_messages call per 200 ids (Telegram limit); None for segments that are gone
+        fps = []
+        for chunk in chunked([int(x) for x in ids], 200):
+            msgs = await app.get_messages(chat_id, chunk)
+            fps.extend(message_fingerprint(x) for x in msgs)
+        return fps
+
+    def compare_fingerprints(primary, fps):
+        # 1-based segment numbers missing from a copy, and those whose file differs from the primary
+        missing = [i + 1 for i, fp in enumerate(fps) if fp is None]
+        mismatched = [i + 1 for i, fp in enumerate(fps) if fp is not None and i < len(primary) and primary[i] is not None and fp != primary[i]]
+        return missing, mismatched
+
+    @app.on_message(filters.command("add_mirror") & filters.private & filters.user(OWNER_ID))
+    async def cmd_add_mirror(_, m: Message):
+        # /add_mirror <movie_id>|<storage_chat_id>|<message_ids>
+        if len(m.text.split(" ",1)) < 2:
+            await m.reply("Usage:\n/add_mirror <movie_id>|<storage_chat_id>|<message_ids>\nmessage_ids in the same order as the movie's segments")
+            return
+        try:
+            payload = m.text.split(" ",1)[1]
+            movie_id_s, chat_id_s, ids_text = [p.strip() for p in payload.split("|",2)]
+            movie_id = int(movie_id_s)
+            chat_id = int(chat_id_s)
+        except:
+            await m.reply("Invalid format. Use:\n/add_mirror <movie_id>|<storage_chat_id>|<message_ids>")
+            return
+        if chat_id == STORAGE_CHAT_ID or chat_id not in STORAGE_CHAT_IDS:
+            await m.reply("That chat is not a configured mirror storage group (see STORAGE_MIRROR_CHAT_IDS).")
+            return
+        movie = get_movie_by_id(movie_id)
+        if not movie:
+            await m.reply("Movie not found.")
+            return
+        message_ids = parse_ids_text(ids_text)
+        primary_ids = json.loads(movie.get("message_ids") or "[]")
+        if len(message_ids) != len(primary_ids):
+            await m.reply(f"Mirror must have {len(primary_ids)} message IDs, got {len(message_ids)}.")
+            return
+        # the mirror is used for delivery right away, so it must hold the same files in the same order
+        try:
+            primary = await fetch_fingerprints(STORAGE_CHAT_ID, primary_ids)
+            fps = await fetch_fingerprints(chat_id, message_ids)
+        except Exception as e:
+            await m.reply(f"Couldn't read storage chats: {e}")
+            return
+        missing, mismatched = compare_fingerprints(primary, fps)
+        if missing or mismatched:
+            text = "Mirror not saved."
+            if missing:
+                text += f"\nMissing in mirror: segments {format_ranges(missing)}"
+            if mismatched:
+                text += f"\nDiffers from primary: segments {format_ranges(mismatched)}"
+            await m.reply(text)
+            return
+        set_movie_mirror(movie_id, chat_id, message_ids)
+        unchecked = [i + 1 for i, fp in enumerate(primary) if fp is None]
+        text = f"Mirror {chat_id} verified and set for movie {movie_id}."
+        if unchecked:
+            text += f"\nPrimary copies of segments {format_ranges(unchecked)} are gone, so those couldn't be compared."
+        await m.reply(text)
+
+    @app.on_message(filters.command("remove_mirror") & filters.private & filters.user(OWNER_ID))
+    async def cmd_remove_mirror(_, m: Message):
+        # /remove_mirror <movie_id>|<storage_chat_id>
+        if len(m.text.split(" ",1)) < 2:
+            await m.reply("Usage: /remove_mirror <movie_id>|<storage_chat_id>")
+            return
+        try:
+            payload = m.text.split(" ",1)[1]
+            movie_id_s, chat_id_s = [p.strip() for p in payload.split("|",1)]
+            movie_id = int(movie_id_s)
+            chat_id = int(chat_id_s)
+        except:
+            await m.reply("Invalid params.")
+            return
+        if not delete_movie_mirror(movie_id, chat_id):
+            await m.reply("No such mirror.")
+            return
+        await m.reply("Mirror removed.")
+
+    @app.on_message(filters.command("verify_mirrors") & filters.private & filters.user(OWNER_ID))
+    async def cmd_verify_mirrors(_, m: Message):
+        # /verify_mirrors <movie_id> - compare every copy of each segment across storage chats
+        if len(m.text.split(" ",1)) < 2:
+            await m.reply("Usage: /verify_mirrors <movie_id>")
+            return
+        try:
+            movie_id = int(m.text.split(" ",1)[1].strip())
+        except:
+            await m.reply("Invalid movie id")
+            return
+        movie = get_movie_by_id(movie_id)
+        if not movie:
+            await m.reply("Movie not found.")
+            return
+        sources = [(STORAGE_CHAT_ID, json.loads(movie.get("message_ids") or "[]"))]
+        sources += [(r["chat_id"], json.loads(r.get("message_ids") or "[]")) for r in list_movie_mirrors(movie_id)]
+        prints = {}
+        for chat_id, ids in sources:
+            try:
+                fps = await fetch_fingerprints(chat_id, ids)
+            except Exception as e:
+                await m.reply(f"Couldn't read storage chat {chat_id}: {e}")
+                fps = [None] * len(ids)
+            prints[chat_id] = fps
+        primary = prints[STORAGE_CHAT_ID]
+        lines = [f"Mirror check for movie {movie_id} ({len(primary)} segments):"]
+        for chat_id, fps in prints.items():
+            missing, mismatched = compare_fingerprints(primary, fps)
+            status = "OK" if not missing and not mismatched and len(fps) == len(primary) else "BROKEN"
+            line = f"- {chat_id}: {status}"
+            if missing:
+                line += f" | missing segments {format_ranges(missing)}"
+            if mismatched:
+                line += f" | differs from primary at {format_ranges(mismatched)}"
+            lines.append(line)
+        # stay under Telegram's 4096 character message limit
+        text = ""
+        for line in lines:
+            while len(line) > 4000:
+                if text:
+                    await m.reply(text)
+                    text = ""
+                await m.reply(line[:4000])
+                line = line[4000:]
+            if len(text) + len(line) + 1 > 4000:
+                await m.reply(text)
+                text = ""
+            text += line + "\n"
+        if text:
+            await m.reply(text)
+
     @app.on_message(filters.command("genlink") & filters.private & filters.user(OWNER_ID))
     async def cmd_genlink(_, m: Message):
         # /genlink <movie_id>
@@ -153,20 +294,26 @@ def register_admin_handlers(app):
             await m.reply("Usage: /broadcast <text>")
             return
         text = m.text.split(" ",1)[1]
-        # naive broadcast: iterate all users
-        from db import get_conn
-        conn = get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM users")
-        rows = cur.fetchall()
-        conn.close()
+        # iterate live users only; recipients that fail permanently are marked dead in batches
+        user_ids = list_live_user_ids()
         count = 0
-        for r in rows:
+        dead = []
+        dead_total = 0
+        for uid in user_ids:
             try:
-                await app.send_message(r["id"], text)
+                await app.send_message(uid, text)
                 count += 1
                 await asyncio.sleep(0.05)
-            except Exception:
-                pass
-        await m.reply(f"Broadcast sent to {count} users.")
+            except Exception as e:
+                reason = classify_send_error(e)
+                if reason:
+                    dead.append((uid, reason))
+                    if len(dead) >= DEAD_MARK_BATCH:
+                        mark_users_dead(dead)
+                        dead_total += len(dead)
+                        dead = []
+        if dead:
+            mark_users_dead(dead)
+            dead_total += len(dead)
+        await m.reply(f"Broadcast sent to {count} users. {dead_total} unreachable users marked dead.")
 ```
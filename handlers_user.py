@@ -2,12 +2,24 @@ User-facing handlers: /start deep link, force-join check, try again, delivery pi
 
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
-from config import STORAGE_CHAT_ID, OWNER_ID, DEFAULT_SEND_DELAY, WAIT_AD_SECONDS, VIP_PRICE_LABEL
-from db import get_movie_by_token, get_movie_by_id, add_user_if_missing, is_vip, list_force_channels, get_latest_waiting_ad
-from utils import parse_ids_text
+from pyrogram.errors import FloodWait, MessageIdInvalid, ChannelPrivate, ChannelInvalid, ChatAdminRequired
+from config import STORAGE_CHAT_ID, STORAGE_CHAT_IDS, OWNER_ID, DEFAULT_SEND_DELAY, WAIT_AD_SECONDS, VIP_PRICE_LABEL, STORAGE_COOLDOWN_SECONDS, FLOOD_WAIT_MAX_SECONDS
+from db import get_movie_by_token, get_movie_by_id, add_user_if_missing, revive_user, mark_users_dead, is_vip, list_force_channels, get_latest_waiting_ad, list_movie_mirrors
+from utils import parse_ids_text, classify_send_error, format_ranges, DEAD_BLOCKED, DEAD_DEACTIVATED
 import asyncio
+import json
+import random
+import time
+
+# errors that mean the storage chat itself can't be read from right now
+STORAGE_CHAT_ERRORS = (ChannelPrivate, ChannelInvalid, ChatAdminRequired)
+FLOOD_WAIT_RETRIES = 3
 
 def register_user_handlers(app):
+    # per storage chat: copies in flight, and time until which the chat is avoided after it became unreadable
+    storage_inflight = {}
+    storage_cooldown = {}
+
     @app.on_message(filters.command("start") & filters.private)
     async def start_handler(client, m):
         # /start or /start token
@@ -16,6 +28,8 @@ def register_user_handlers(app):
         if len(args) > 1:
             token = args[1].strip()
         if not token:
+            # a user who blocked us earlier and is back can receive messages again
+            revive_user(m.from_user.id)
             await m.reply("Welcome! Send me a valid movie link to start.")
             return
         movie = get_movie_by_token(token)
@@ -24,6 +38,7 @@ def register_user_handlers(app):
             return
         uid = m.from_user.id
         add_user_if_missing(uid)
+        revive_user(uid)
         # force join check
         chan_rows = list_force_channels()
         not_joined = []
@@ -72,6 +87,90 @@ def register_user_handlers(app):
             await cq.message.delete()
             await deliver_movie(client, cq.from_user.id, movie)
 
+    def segment_sources(movie, msg_ids):
+        # [(storage_chat_id, message_ids)] for the primary storage chat plus every complete, still configured mirror
+        sources = [(STORAGE_CHAT_ID, msg_ids)]
+        for row in list_movie_mirrors(movie["id"]):
+            try:
+                ids = json.loads(row.get("message_ids") or "[]")
+            except:
+                continue
+            if len(ids) == len(msg_ids) and row["chat_id"] != STORAGE_CHAT_ID and row["chat_id"] in STORAGE_CHAT_IDS:
+                sources.append((row["chat_id"], ids))
+        return sources
+
+    def pick_order(sources):
+        # fewest copies in flight first, ties broken randomly, cooling-down chats last
+        now = time.monotonic()
+        return sorted(sources, key=lambda s: (storage_cooldown.get(s[0], 0) > now,
+                                              storage_inflight.get(s[0], 0),
+                                              random.random()))
+
+    async def copy_segment(client, chat_id, src_chat, mid):
+        # Returns "ok", "dead" (recipient gone), "source" (storage side at fault: try another mirror) or "failed".
+        storage_inflight[src_chat] = storage_inflight.get(src_chat, 0) + 1
+        try:
+            for _ in range(FLOOD_WAIT_RETRIES):
+                try:
+                    copied = await client.copy_message(chat_id, src_chat, mid)
+                except FloodWait as e:
+                    # our own rate limit: every mirror would hit it too, so wait it out on this one
+                    await asyncio.sleep(min(e.value, FLOOD_WAIT_MAX_SECONDS))
+                    continue
+                # pyrogram returns None instead of raising when the source message was deleted (empty)
+                return "ok" if copied is not None else "source"
+            return "failed"
+        except (MessageIdInvalid, ValueError):
+            # this copy is gone or is a service message ("cannot be copied"); the chat itself is fine
+            return "source"
+        except STORAGE_CHAT_ERRORS:
+            storage_cooldown[src_chat] = time.monotonic() + STORAGE_COOLDOWN_SECONDS
+            return "source"
+        except Exception as e:
+            reason = classify_send_error(e)
+            if reason in (DEAD_BLOCKED, DEAD_DEACTIVATED):
+                mark_users_dead([(chat_id, reason)])
+                return "dead"
+            return "failed"
+        finally:
+            storage_inflight[src_chat] -= 1
+
+    async def send_segments(client, chat_id, sources):
+        # Copy video segments in order, spreading copies over the storage mirrors and failing over on
+        # storage-side errors. Returns False if the recipient turned out to be dead.
+        missing = []
+        for i in range(len(sources[0][1])):
+            delivered = False
+            for src_chat, ids in pick_order(sources):
+                outcome = await copy_segment(client, chat_id, src_chat, int(ids[i]))
+                if outcome == "dead":
+                    return False
+                if outcome == "ok":
+                    delivered = True
+                # any other mirror would fail the same way unless the storage side was at fault
+                if outcome != "source":
+                    break
+            if not delivered:
+                missing.append(i + 1)
+            await asyncio.sleep(DEFAULT_SEND_DELAY)
+        if missing:
+            print(f"Delivery to {chat_id}: segments {format_ranges(missing)} could not be copied from any storage chat")
+            return await notify(client, chat_id, f"Sorry, segment(s) {format_ranges(missing)} couldn't be delivered right now. Please try again later.")
+        return True
+
+    async def notify(client, chat_id, text, **kwargs):
+        # send_message to the recipient; returns False (and marks them dead) if they can no longer receive messages
+        try:
+            await client.send_message(chat_id, text, **kwargs)
+            return True
+        except Exception as e:
+            # only the recipient's peer is involved here, so every dead reason applies
+            reason = classify_send_error(e)
+            if not reason:
+                raise
+            mark_users_dead([(chat_id, reason)])
+            return False
+
     async def deliver_movie(client, chat_id, movie_row):
         # Main entry point for delivery flow
         movie = movie_row
@@ -85,10 +184,11 @@ def register_user_handlers(app):
             try:
                 await client.copy_message(chat_id, movie["poster_chat_id"], movie["poster_message_id"], caption=movie.get("caption") or "")
             except Exception:
-                # fallback to send text
-                await client.send_message(chat_id, movie.get("caption") or movie.get("title") or "Here's your movie.")
-        else:
-            await client.send_message(chat_id, movie.get("caption") or movie.get("title") or "Here's your movie.")
+                # fallback to send text (also detects a recipient who blocked us)
+                if not await notify(client, chat_id, movie.get("caption") or movie.get("title") or "Here's your movie."):
+                    return
+        elif not await notify(client, chat_id, movie.get("caption") or movie.get("title") or "Here's your movie."):
+            return
 
         # build inline menu below caption
         menu = InlineKeyboardMarkup([
@@ -98,30 +198,27 @@ def register_user_handlers(app):
             [InlineKeyboardButton("ℹ️ ABOUT", callback_data="about_bot")],
             [InlineKeyboardButton("👨‍💻 Owner", url=f"https://t.me/{OWNER_ID}")],
         ])
-        await client.send_message(chat_id, "Choose:", reply_markup=menu)
+        if not await notify(client, chat_id, "Choose:", reply_markup=menu):
+            return
 
         # Delivery logic
         msg_ids = []
         try:
-            import json
             msg_ids = json.loads(movie.get("message_ids") or "[]")
         except:
             msg_ids = []
         if not msg_ids:
-            await client.send_message(chat_id, "No video segments found for this movie.")
+            await notify(client, chat_id, "No video segments found for this movie.")
             return
+        sources = segment_sources(movie, msg_ids)
 
         if vip:
-            await client.send_message(chat_id, "VIP detected — starting delivery...")
+            if not await notify(client, chat_id, "VIP detected — starting delivery..."):
+                return
             # immediate delivery, short interval
-            for mid in msg_ids:
-                try:
-                    await client.copy_message(chat_id, STORAGE_CHAT_ID, int(mid))
-                    await asyncio.sleep(DEFAULT_SEND_DELAY)
-                except Exception as e:
-                    # skip problematic message
-                    pass
-            await client.send_message(chat_id, "Delivery finished.")
+            if not await send_segments(client, chat_id, sources):
+                return
+            await notify(client, chat_id, "Delivery finished.")
             return
 
         # Non-VIP: show waiting ad first
@@ -131,45 +228,40 @@ def register_user_handlers(app):
             try:
                 if ad.get("media_message_id") and ad.get("media_chat_id"):
                     await client.copy_message(chat_id, ad["media_chat_id"], ad["media_message_id"], caption=ad.get("text", "Advertisement"))
-                else:
-                    await client.send_message(chat_id, ad.get("text", "Advertisement"))
+                elif not await notify(client, chat_id, ad.get("text", "Advertisement")):
+                    return
             except Exception:
                 try:
-                    if ad.get("text"):
-                        await client.send_message(chat_id, ad.get("text"))
+                    if ad.get("text") and not await notify(client, chat_id, ad.get("text")):
+                        return
                 except:
                     pass
         else:
             # generic waiting message
-            await client.send_message(chat_id, f"Please wait... advertisement (you can buy VIP to bypass). {VIP_PRICE_LABEL}")
+            if not await notify(client, chat_id, f"Please wait... advertisement (you can buy VIP to bypass). {VIP_PRICE_LABEL}"):
+                return
 
         # Show Buy VIP button under ad
         buy_kb = InlineKeyboardMarkup([
             [InlineKeyboardButton("Buy VIP", url=f"https://t.me/osamu1123")],
             [InlineKeyboardButton("Try Again", callback_data=f"deliver_now:{movie['id']}")]
         ])
-        sent = await client.send_message(chat_id, f"Waiting for {WAIT_AD_SECONDS} seconds before delivery. Or buy VIP to skip.", reply_markup=buy_kb)
+        if not await notify(client, chat_id, f"Waiting for {WAIT_AD_SECONDS} seconds before delivery. Or buy VIP to skip.", reply_markup=buy_kb):
+            return
         # Sleep WAIT_AD_SECONDS then deliver
         await asyncio.sleep(WAIT_AD_SECONDS)
         # Check again VIP status in case user bought
         if is_vip(chat_id):
-            await client.send_message(chat_id, "VIP detected now — starting delivery...")
-            for mid in msg_ids:
-                try:
-                    await client.copy_message(chat_id, STORAGE_CHAT_ID, int(mid))
-                    await asyncio.sleep(DEFAULT_SEND_DELAY)
-                except:
-                    pass
-            await client.send_message(chat_id, "Delivery finished.")
+            if not await notify(client, chat_id, "VIP detected now — starting delivery..."):
+                return
+            if not await send_segments(client, chat_id, sources):
+                return
+            await notify(client, chat_id, "Delivery finished.")
             return
         # final delivery for non-VIP
-        for mid in msg_ids:
-            try:
-                await client.copy_message(chat_id, STORAGE_CHAT_ID, int(mid))
-                await asyncio.sleep(DEFAULT_SEND_DELAY)
-            except:
-                pass
-        await client.send_message(chat_id, "Delivery finished.")
+        if not await send_segments(client, chat_id, sources):
+            return
+        await notify(client, chat_id, "Delivery finished.")
 
     # extra callback to immediately deliver if user clicks deliver_now
     @app.on_callback_query(filters.regex(r"^deliver_now:"))
@@ -1,5 +1,5 @@
-from bot import app
+from bot import app, main
 
 if __name__ == "__main__":
     print("Starting bot...")
-    app.run()
+    app.run(main())
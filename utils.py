@@ -4,6 +4,12 @@ import re
 import secrets
 import json
 from typing import List
+from pyrogram.errors import UserIsBlocked, InputUserDeactivated, PeerIdInvalid
+
+# Reasons stored in users.dead_reason
+DEAD_BLOCKED = "blocked"
+DEAD_DEACTIVATED = "deactivated"
+DEAD_PEER_INVALID = "peer_invalid"
 
 def parse_ids_text(text: str) -> List[int]:
     # Supports comma separated and ranges like 100-105 and combos
@@ -41,4 +47,37 @@ def gen_token(nbytes=6):
 
 def stringify_ids(ids):
     return json.dumps(ids)
+
+def format_ranges(nums):
+    # [3,4,5,9] -> "3-5, 9" (inverse of parse_ids_text)
+    out = []
+    for x in sorted(set(nums)):
+        if out and x == out[-1][1] + 1:
+            out[-1][1] = x
+        else:
+            out.append([x, x])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in out)
+
+def chunked(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i+size]
+
+def message_fingerprint(msg):
+    # Identifies a stored segment across chats: copies of one file share file_unique_id. None if the message is gone.
+    if msg is None or getattr(msg, "empty", False):
+        return None
+    if msg.media:
+        media = getattr(msg, msg.media.value, None)
+        return (msg.media.value, getattr(media, "file_unique_id", None))
+    return ("text", msg.text)
+
+def classify_send_error(exc):
+    # Returns a dead reason for permanent per-user failures, None for transient ones (flood wait, network, ...)
+    if isinstance(exc, UserIsBlocked):
+        return DEAD_BLOCKED
+    if isinstance(exc, InputUserDeactivated):
+        return DEAD_DEACTIVATED
+    if isinstance(exc, PeerIdInvalid):
+        return DEAD_PEER_INVALID
+    return None
 ```